@@ -1,20 +1,72 @@
 from fastapi import FastAPI, BackgroundTasks
 from fastapi.responses import FileResponse
 import uuid
+import asyncio
+import csv
+import json
+from functools import lru_cache
 import pandas as pd
+import numpy as np
 import sqlite3
 import os
-from datetime import datetime, timedelta, timezone
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
 import zoneinfo
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 DB_FILE = "store_monitoring.db"
+CSV_FILES = ["store_status.csv", "menu_hours.csv", "timezones.csv"]
+INGEST_META_FILE = "ingest_meta.json"
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 86400 * 1_000_000_000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=None)
+def _get_tz(name):
+    """ZoneInfo parses tzdata on construction; cache the immutable objects"""
+    return zoneinfo.ZoneInfo(name)
+
+def tune_connection(conn):
+    """Apply PRAGMAs that keep hot pages resident and avoid per-statement fsyncs"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-200000")
+
+# One long-lived connection shared by the endpoints and the report status
+# updates; sqlite3 objects aren't safe for concurrent use from multiple
+# threads, so every access goes through _db_lock
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(DB_FILE, check_same_thread=False)
+        tune_connection(_db)
+        # serve reads through mmap to skip a userspace copy
+        _db.execute("PRAGMA mmap_size=268435456")
+    return _db
+
+# Report status lives in-process: it is written once per report and read a
+# few times while polling, so it does not need SQLite. Handlers read/write
+# under the asyncio lock; the background worker thread's plain item
+# assignments are atomic under the GIL.
+_reports = {}
+_reports_lock = asyncio.Lock()
 
 def init_db():
     conn = sqlite3.connect(DB_FILE)
+    tune_connection(conn)
     c = conn.cursor()
     c.execute("""CREATE TABLE IF NOT EXISTS store_status(
-        store_id TEXT, timestamp_utc TEXT, status TEXT
+        store_id TEXT, timestamp_utc INTEGER, status TEXT
     )""")
     c.execute("""CREATE TABLE IF NOT EXISTS business_hours(
         store_id TEXT, day_of_week INTEGER, start_time_local TEXT, end_time_local TEXT
@@ -22,142 +74,352 @@ def init_db():
     c.execute("""CREATE TABLE IF NOT EXISTS store_timezone(
         store_id TEXT, timezone_str TEXT
     )""")
-    c.execute("""CREATE TABLE IF NOT EXISTS report_status(
-        report_id TEXT PRIMARY KEY, status TEXT, csv_path TEXT
-    )""")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_status_store_ts ON store_status(store_id, timestamp_utc)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_bh_store ON business_hours(store_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tz_store ON store_timezone(store_id)")
     conn.commit()
     conn.close()
 
+def _csv_meta():
+    """(mtime, size) fingerprint of the source CSVs, or None if any is missing"""
+    try:
+        return {path: [os.stat(path).st_mtime, os.stat(path).st_size] for path in CSV_FILES}
+    except OSError:
+        return None
+
+def _ingest_is_fresh(conn, meta):
+    """True when the CSVs match the last ingest and the tables are populated"""
+    if meta is None or not os.path.exists(INGEST_META_FILE):
+        return False
+    try:
+        with open(INGEST_META_FILE) as f:
+            if json.load(f) != meta:
+                return False
+    except (ValueError, OSError):
+        return False
+    return conn.execute("SELECT EXISTS(SELECT 1 FROM store_status)").fetchone()[0] == 1
+
 def ingest_csvs():
     conn = sqlite3.connect(DB_FILE)
-    
+    tune_connection(conn)
+
+    # Ingest runs on every startup; skip the whole parse when the CSVs
+    # haven't changed since the tables were last written
+    meta = _csv_meta()
+    if _ingest_is_fresh(conn, meta):
+        conn.close()
+        print("CSVs unchanged, skipping ingest")
+        return
+
+    # Bulk load: skip fsyncs entirely while rewriting the tables (a crash
+    # mid-ingest just means re-ingesting from the CSVs on next startup)
+    conn.execute("PRAGMA synchronous=OFF")
+
     conn.execute("DELETE FROM store_status")
-    conn.execute("DELETE FROM business_hours") 
+    conn.execute("DELETE FROM business_hours")
     conn.execute("DELETE FROM store_timezone")
-    
+
+    # Each multi-values INSERT binds rows x columns host parameters; size
+    # chunks against this build's limit (32766 on stock SQLite >= 3.32)
+    try:
+        max_vars = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    except AttributeError:  # Connection.getlimit needs Python 3.11
+        max_vars = 999
+
+    def chunk_rows(df):
+        return min(10000, max_vars // len(df.columns))
+
     try:
         status_df = pd.read_csv("store_status.csv")
         status_df = status_df[['store_id', 'timestamp_utc', 'status']]
-        status_df.to_sql("store_status", conn, if_exists='append', index=False)
+        # Parse once at ingest and persist as epoch nanoseconds; every
+        # report then works on int64 compares instead of re-parsing strings.
+        # The trailing " UTC" is handled as a format literal, avoiding a
+        # separate str.replace pass over the column
+        status_df['timestamp_utc'] = pd.to_datetime(
+            status_df['timestamp_utc'], format='%Y-%m-%d %H:%M:%S.%f UTC',
+            utc=True, cache=True).dt.as_unit('ns').astype('int64')
+        status_df.to_sql("store_status", conn, if_exists='append', index=False,
+                         method='multi', chunksize=chunk_rows(status_df))
         
         hours_df = pd.read_csv("menu_hours.csv")
         hours_df = hours_df.rename(columns={'dayOfWeek': 'day_of_week'})
-        hours_df.to_sql("business_hours", conn, if_exists='append', index=False)
+        hours_df.to_sql("business_hours", conn, if_exists='append', index=False,
+                        method='multi', chunksize=chunk_rows(hours_df))
         
         tz_df = pd.read_csv("timezones.csv")
-        tz_df.to_sql("store_timezone", conn, if_exists='append', index=False)
+        tz_df.to_sql("store_timezone", conn, if_exists='append', index=False,
+                     method='multi', chunksize=chunk_rows(tz_df))
         
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if meta is not None:
+            with open(INGEST_META_FILE, 'w') as f:
+                json.dump(meta, f)
         print("Data ingested successfully")
     except Exception as e:
         print(f"Error ingesting data: {e}")
     finally:
         conn.close()
 
-def compute_store_metrics(store_id, current_utc, status_df, business_df, timezone_df):
+def _overlap_ns(seg_starts, seg_ends, seg_active, bh_starts, bh_ends):
+    """Walk status segments and business intervals in merge order,
+    accumulating per-segment uptime and business nanoseconds.
+
+    Small-array work where NumPy dispatch overhead dominates, so it is
+    written as a plain loop and JIT-compiled below when numba is present."""
+    n = seg_starts.shape[0]
+    seg_up = np.zeros(n, dtype=np.int64)
+    seg_bh = np.zeros(n, dtype=np.int64)
+    i = 0
+    k = 0
+    while i < n and k < bh_starts.shape[0]:
+        a = seg_starts[i] if seg_starts[i] > bh_starts[k] else bh_starts[k]
+        b = seg_ends[i] if seg_ends[i] < bh_ends[k] else bh_ends[k]
+        if b > a:
+            seg_bh[i] += b - a
+            if seg_active[i]:
+                seg_up[i] += b - a
+        if seg_ends[i] < bh_ends[k]:
+            i += 1
+        else:
+            k += 1
+    return seg_up, seg_bh
+
+if njit is not None:
+    _overlap_ns = njit(cache=True, nogil=True)(_overlap_ns)
+
+@lru_cache(maxsize=None)
+def _tz_offset_table(tz_name, start_ord, end_ord):
+    """UTC-offset transitions for tz over local days [start_ord, end_ord].
+
+    Samples utcoffset hourly and keeps the change points, keyed by local
+    wall-clock nanoseconds, so utc_ns = local_ns - offsets[idx] where
+    idx = searchsorted(transitions, local_ns, 'right') - 1."""
+    tz = _get_tz(tz_name)
+    transitions = []
+    offsets = []
+    dt = datetime.combine(date.fromordinal(start_ord), time.min)
+    end_dt = datetime.combine(date.fromordinal(end_ord), time.min) + timedelta(days=1)
+    prev = None
+    while dt <= end_dt:
+        offset_ns = int(dt.replace(tzinfo=tz).utcoffset().total_seconds()) * 1_000_000_000
+        if offset_ns != prev:
+            local_ns = (dt.toordinal() - EPOCH_ORDINAL) * NS_PER_DAY + dt.hour * 3600 * 1_000_000_000
+            # The first offset extends backwards so lookups never miss
+            transitions.append(local_ns if prev is not None else np.iinfo(np.int64).min)
+            offsets.append(offset_ns)
+            prev = offset_ns
+        dt += timedelta(hours=1)
+    return np.array(transitions, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+def _weekly_open_mask(schedule):
+    """Canonicalize a local schedule as a 10080-bit minute-of-week bitmap.
+
+    The schedule is a tuple of (day_of_week, start, end) triples — a day
+    may appear several times. Overlapping and overnight rows merge
+    naturally instead of producing double-counted intervals; sub-minute
+    end times round up to the next minute (so a 23:59:59 close covers
+    through midnight)."""
+    mask = np.zeros(7 * 1440, dtype=np.bool_)
+    for day, start_str, end_str in schedule:
+        start_t = time.fromisoformat(start_str)
+        end_t = time.fromisoformat(end_str)
+        start_min = int(day) * 1440 + start_t.hour * 60 + start_t.minute
+        end_min = int(day) * 1440 + end_t.hour * 60 + end_t.minute + (1 if end_t.second else 0)
+        if end_min <= start_min:  # overnight, wraps into the next day
+            end_min += 1440
+        mask[np.arange(start_min, end_min) % mask.shape[0]] = True
+    return mask
+
+def precompute_business_intervals(schedule, tz, window_start_utc, window_end_utc):
+    """Expand a (day_of_week, start, end) schedule into sorted UTC-ns intervals.
+
+    The schedule becomes a weekly minute bitmap, contiguous runs of open
+    minutes become local intervals for each week touching the window, and
+    those are converted to UTC in one vectorized lookup against the cached
+    per-timezone offset table instead of per-datetime astimezone calls."""
+    mask = _weekly_open_mask(schedule)
+    delta = np.diff(mask.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    run_starts = np.flatnonzero(delta == 1)
+    run_ends = np.flatnonzero(delta == -1)
+    if run_starts.size == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    first_ord = window_start_utc.astimezone(tz).date().toordinal()
+    last_ord = window_end_utc.astimezone(tz).date().toordinal()
+    monday_ord = first_ord - ((first_ord - 1) % 7)  # ordinal 1 is a Monday
+    week_ords = np.arange(monday_ord, last_ord + 1, 7, dtype=np.int64)
+
+    base_ns = (week_ords - EPOCH_ORDINAL) * NS_PER_DAY
+    starts_local = (base_ns[:, None] + run_starts[None, :] * NS_PER_MINUTE).ravel()
+    ends_local = (base_ns[:, None] + run_ends[None, :] * NS_PER_MINUTE).ravel()
+
+    transitions, offsets = _tz_offset_table(tz.key, int(week_ords[0]), int(week_ords[-1]) + 7)
+    bh_starts = starts_local - offsets[np.searchsorted(transitions, starts_local, side='right') - 1]
+    bh_ends = ends_local - offsets[np.searchsorted(transitions, ends_local, side='right') - 1]
+    return bh_starts, bh_ends
+
+@lru_cache(maxsize=1024)
+def _business_intervals_cached(schedule, tz_name, start_ns, end_ns):
+    """Many stores share the same (schedule, timezone) pair, and the window
+    is fixed for a whole report; memoize on hashable keys so only the first
+    store with a given pair pays for the expansion."""
+    return precompute_business_intervals(
+        schedule, _get_tz(tz_name),
+        pd.Timestamp(start_ns, tz='UTC'), pd.Timestamp(end_ns, tz='UTC'))
+
+def compute_store_metrics(store_id, current_utc, status_groups, business_by_store, tz_by_store):
     """Compute uptime/downtime metrics for a store"""
-    
-    store_status = status_df[status_df['store_id'] == store_id].copy()
-    store_business = business_df[business_df['store_id'] == store_id]
-    store_tz = timezone_df[timezone_df['store_id'] == store_id]
-    
-    timezone_str = store_tz['timezone_str'].iloc[0] if not store_tz.empty else "America/Chicago"
+
+    store_status = status_groups[store_id]
     try:
-        tz = zoneinfo.ZoneInfo(timezone_str)
+        store_business = business_by_store.loc[[store_id]]
+    except KeyError:
+        store_business = None
+
+    timezone_str = tz_by_store.get(store_id, "America/Chicago")
+    try:
+        tz = _get_tz(timezone_str)
     except:
-        tz = zoneinfo.ZoneInfo("America/Chicago")
-    
-    business_hours = {}
-    if store_business.empty:
-        for day in range(7):
-            business_hours[day] = ("00:00:00", "23:59:59")
+        tz = _get_tz("America/Chicago")
+
+    # Keep every schedule row — a day may have several intervals; the
+    # weekly bitmap merges any overlaps between them
+    if store_business is None:
+        schedule = tuple((day, "00:00:00", "23:59:59") for day in range(7))
     else:
-        for _, row in store_business.iterrows():
-            business_hours[row['day_of_week']] = (row['start_time_local'], row['end_time_local'])
-    
-    store_status['timestamp_utc'] = pd.to_datetime(store_status['timestamp_utc'].str.replace(' UTC', '', regex=False)).dt.tz_localize('UTC')
-    store_status = store_status.sort_values('timestamp_utc')
-    
+        schedule = tuple(sorted(
+            (int(row['day_of_week']), row['start_time_local'], row['end_time_local'])
+            for _, row in store_business.iterrows()))
+
+    # timestamp_utc is epoch nanoseconds and rows arrive ordered by
+    # (store_id, timestamp_utc) from SQL
+    ts_ns = store_status['timestamp_utc'].to_numpy(dtype=np.int64)
+    active = (store_status['status'].to_numpy() == 'active')
+
     one_hour_ago = current_utc - timedelta(hours=1)
     one_day_ago = current_utc - timedelta(days=1)
     one_week_ago = current_utc - timedelta(weeks=1)
-    
+
+    bh_starts, bh_ends = _business_intervals_cached(
+        schedule, tz.key, one_week_ago.value, current_utc.value)
+
+    p0 = one_week_ago.value
+    p1 = current_utc.value
+    day_ns = one_day_ago.value
+    hour_ns = one_hour_ago.value
+    idx0 = np.searchsorted(ts_ns, p0, side='left')
+    idx1 = np.searchsorted(ts_ns, p1, side='right')
+
+    if idx0 == idx1:
+        return [0.0] * 6
+
+    # One sweep over the whole week: segment edges are the window bounds,
+    # every observation inside it, and the day/hour cutoffs (inserted as
+    # edges so the shorter periods are exact suffix sums of segments).
+    # Each segment carries the status of the last observation at or before
+    # its start (extrapolating the first in-window status backwards).
+    inner = np.sort(np.concatenate([ts_ns[idx0:idx1], [day_ns, hour_ns]]))
+    edges = np.empty(inner.shape[0] + 2, dtype=np.int64)
+    edges[0] = p0
+    edges[1:-1] = inner
+    edges[-1] = p1
+    # Last observation at or before each segment start; binary search over
+    # the in-window slice only, never a rescan of the full history
+    last_obs_idx = np.searchsorted(ts_ns[idx0:idx1], edges[:-1], side='right') + idx0 - 1
+    seg_active = active[np.clip(last_obs_idx, 0, None)]
+
+    seg_up, seg_bh = _overlap_ns(edges[:-1], edges[1:], seg_active, bh_starts, bh_ends)
+
     metrics = []
-    
-    for period_start, period_name in [(one_hour_ago, "hour"), (one_day_ago, "day"), (one_week_ago, "week")]:
-        period_obs = store_status[
-            (store_status['timestamp_utc'] >= period_start) & 
-            (store_status['timestamp_utc'] <= current_utc)
-        ]
-        
-        if period_obs.empty:
-            metrics.extend([0.0, 0.0])
-            continue
-        total_business_minutes = 0
-        uptime_minutes = 0
-        
-        # Simplified calculation
-        if not period_obs.empty:
-            last_status = period_obs.iloc[-1]['status']
-            if period_name == "hour":
-                total_business_minutes = 60
-            elif period_name == "day":
-                total_business_minutes = 12 * 60
-            else:
-                total_business_minutes = 7 * 12 * 60
-            
-            if last_status == "active":
-                uptime_minutes = total_business_minutes
-            else:
-                uptime_minutes = 0
-        
+    for cutoff, period_name in [(hour_ns, "hour"), (day_ns, "day"), (p0, "week")]:
+        start_seg = np.searchsorted(edges, cutoff, side='left')
+        uptime_minutes = seg_up[start_seg:].sum() / NS_PER_MINUTE
+        total_business_minutes = seg_bh[start_seg:].sum() / NS_PER_MINUTE
+
         if period_name == "hour":
             uptime = uptime_minutes
             downtime = total_business_minutes - uptime_minutes
-        else: 
+        else:
             uptime = uptime_minutes / 60.0
             downtime = (total_business_minutes - uptime_minutes) / 60.0
-        
+
         metrics.extend([max(0, uptime), max(0, downtime)])
-    
+
     return metrics
 
+_worker_data = None
+
+def _init_worker(current_utc, status_groups, business_by_store, tz_by_store):
+    """Runs once per pool process; workers read the tables from a global
+    instead of pickling them again for every task"""
+    global _worker_data
+    _worker_data = (current_utc, status_groups, business_by_store, tz_by_store)
+
+def _report_worker(store_id):
+    current_utc, status_groups, business_by_store, tz_by_store = _worker_data
+    return compute_store_metrics(store_id, current_utc, status_groups, business_by_store, tz_by_store)
+
 def generate_report(report_id):
     print(f"Starting report generation for {report_id}")
     try:
-        conn = sqlite3.connect(DB_FILE)
-        
-        status_df = pd.read_sql_query("SELECT * FROM store_status", conn)
-        business_df = pd.read_sql_query("SELECT * FROM business_hours", conn)
-        timezone_df = pd.read_sql_query("SELECT * FROM store_timezone", conn)
-        
-        current_utc = pd.to_datetime(status_df['timestamp_utc'].str.replace(' UTC', '', regex=False)).dt.tz_localize('UTC').max()
+        db = get_db()
+        with _db_lock:
+            status_df = pd.read_sql_query(
+                "SELECT store_id, timestamp_utc, status FROM store_status ORDER BY store_id, timestamp_utc",
+                db)
+            business_df = pd.read_sql_query(
+                "SELECT store_id, day_of_week, start_time_local, end_time_local FROM business_hours",
+                db)
+            timezone_df = pd.read_sql_query("SELECT store_id, timezone_str FROM store_timezone", db)
+
+        # timestamp_utc is already epoch nanoseconds (parsed at ingest)
+        current_utc = pd.Timestamp(int(status_df['timestamp_utc'].max()), tz='UTC')
         
-        report_rows = []
-        for store_id in status_df['store_id'].unique():
-            metrics = compute_store_metrics(store_id, current_utc, status_df, business_df, timezone_df)
-            report_rows.append([store_id] + metrics)
+        store_ids = status_df['store_id'].unique()
+        # Split the status table by store once; per-store access becomes a
+        # dict lookup instead of an O(rows) boolean filter per store. The
+        # two small tables use a sorted store_id index instead: .loc on a
+        # monotonic index is a binary search and skips materializing a
+        # per-store group for every row
+        status_groups = {k: v for k, v in status_df.groupby('store_id', sort=False)}
+        business_by_store = business_df.set_index('store_id').sort_index()
+        tz_by_store = timezone_df.set_index('store_id').sort_index()['timezone_str']
+
+        # Metric computation is CPU-bound and independent per store; fan out
+        # across cores, shipping the groups to each worker once via the
+        # initializer rather than per task
+        # Workers return six floats each; land them in one preallocated
+        # typed array instead of accumulating Python lists
+        metrics_arr = np.empty((len(store_ids), 6), dtype=np.float64)
+        with ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                 initializer=_init_worker,
+                                 initargs=(current_utc, status_groups, business_by_store, tz_by_store)) as ex:
+            for i, metrics in enumerate(ex.map(_report_worker, store_ids, chunksize=64)):
+                metrics_arr[i] = metrics
         
         csv_path = f"report_{report_id}.csv"
-        df = pd.DataFrame(report_rows, columns=[
-            "store_id", "uptime_last_hour", "uptime_last_day", "uptime_last_week",
-            "downtime_last_hour", "downtime_last_day", "downtime_last_week"
-        ])
-        df.to_csv(csv_path, index=False)
+        # csv.writer streams the rows straight to disk; no need to box them
+        # into an object-dtype DataFrame first
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                "store_id", "uptime_last_hour", "uptime_last_day", "uptime_last_week",
+                "downtime_last_hour", "downtime_last_day", "downtime_last_week"
+            ])
+            writer.writerows(
+                [store_id] + row for store_id, row in zip(store_ids, metrics_arr.tolist()))
         print(f"Report saved to {csv_path}")
         
-        conn.execute("UPDATE report_status SET status=?, csv_path=? WHERE report_id=?",
-                     ("Complete", csv_path, report_id))
-        conn.commit()
+        _reports[report_id] = {"status": "Complete", "csv_path": csv_path}
         print(f"Report {report_id} completed")
-        
+
     except Exception as e:
         print(f"Error generating report: {e}")
         import traceback
         traceback.print_exc()
-        conn.execute("UPDATE report_status SET status=? WHERE report_id=?", ("Failed", report_id))
-        conn.commit()
-    finally:
-        conn.close()
+        _reports[report_id] = {"status": "Failed", "csv_path": ""}
 
 from contextlib import asynccontextmanager
 
@@ -165,7 +427,10 @@ from contextlib import asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     ingest_csvs()
+    get_db()
     yield
+    if _db is not None:
+        _db.close()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -176,37 +441,29 @@ async def root():
 @app.post("/trigger_report")
 async def trigger_report(background_tasks: BackgroundTasks):
     report_id = str(uuid.uuid4())
-    conn = sqlite3.connect(DB_FILE)
-    conn.execute("INSERT INTO report_status(report_id, status, csv_path) VALUES (?, ?, ?)",
-                 (report_id, "Running", ""))
-    conn.commit()
-    conn.close()
+    async with _reports_lock:
+        _reports[report_id] = {"status": "Running", "csv_path": ""}
     background_tasks.add_task(generate_report, report_id)
     return {"report_id": report_id}
 
 @app.get("/trigger_report_get")
 async def trigger_report_get(background_tasks: BackgroundTasks):
     report_id = str(uuid.uuid4())
-    conn = sqlite3.connect(DB_FILE)
-    conn.execute("INSERT INTO report_status(report_id, status, csv_path) VALUES (?, ?, ?)",
-                 (report_id, "Running", ""))
-    conn.commit()
-    conn.close()
+    async with _reports_lock:
+        _reports[report_id] = {"status": "Running", "csv_path": ""}
     background_tasks.add_task(generate_report, report_id)
     return {"report_id": report_id}
 
 @app.get("/get_report")
 async def get_report(report_id: str):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT status, csv_path FROM report_status WHERE report_id=?", (report_id,))
-    row = c.fetchone()
-    conn.close()
-    
-    if not row:
+    async with _reports_lock:
+        report = _reports.get(report_id)
+
+    if not report:
         return {"error": "Report not found"}
-    
-    status, csv_path = row
+
+    status = report["status"]
+    csv_path = report["csv_path"]
     if status == "Running":
         return {"status": "Running"}
     elif status == "Complete" and os.path.exists(csv_path):